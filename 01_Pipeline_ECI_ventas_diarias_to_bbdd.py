@@ -10,6 +10,8 @@ import zipfile
 import io
 import os
 import re
+import sqlite3
+from itertools import islice
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 
@@ -23,6 +25,9 @@ SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
 TIPO_DOCUMENTO = "SLSRPT"
 
+# Máximo de claves (SUCURSAL, PERIODO_VENTA, EAN) en memoria antes de volcar a disco
+MAX_CLAVES_MEMORIA = 200_000
+
 
 
 
@@ -82,77 +87,140 @@ if data.get("result") != 1:
     raise Exception(f"Error descarga: {data}")
 
 zip_bytes = base64.b64decode(data["outputData"]["file.zip"])
-edifact_text = ""
+
+# ── PASO 3: PARSEO EDIFACT ─────────────────────────────────
+def iter_lineas_slsrpt(edifact_text):
+    """Devuelve (sucursal, periodo_venta, ean, vendida, devuelta) por cada LIN del fichero"""
+    segments = edifact_text.split("'")
+
+    sucursal      = None
+    periodo_venta = None
+
+    i = 0
+    while i < len(segments):
+        seg = segments[i]
+
+        if seg.startswith("LOC+162"):
+            match = re.search(r'(?<=\+162\+)\d+', seg)
+            if match:
+                sucursal = match.group()
+
+        elif seg.startswith("DTM"):
+            match = re.search(r'(?<=:)\d{8}', seg)
+            if match:
+                periodo_venta = datetime.strptime(match.group(), "%Y%m%d").strftime("%Y-%m-%d")
+
+        elif seg.startswith("LIN"):
+            ean_match = re.search(r'(?<=\+\+)\d+', seg)
+            if not ean_match:
+                i += 1
+                continue
+            ean = ean_match.group()
+            cantidad_vendida  = 0
+            cantidad_devuelta = 0
+
+            j = i + 1
+            while j < len(segments):
+                qty_seg = segments[j]
+                if qty_seg.startswith("QTY"):
+                    qty_type  = re.search(r'(?<=\+)[0-9A-Z]+', qty_seg)
+                    qty_value = re.search(r'(?<=:)\d+', qty_seg)
+                    if qty_type and qty_value:
+                        if qty_type.group() == "153":
+                            cantidad_vendida = int(qty_value.group())
+                        elif qty_type.group() == "77E":
+                            cantidad_devuelta = int(qty_value.group())
+                elif qty_seg.startswith("LIN") or qty_seg.startswith("LOC+162"):
+                    break
+                j += 1
+
+            if sucursal and periodo_venta and ean:
+                yield int(sucursal), periodo_venta, int(ean), cantidad_vendida, cantidad_devuelta
+            i = j - 1
+
+        i += 1
+
+# ── PASO 3b: CONSOLIDACIÓN (SUCURSAL, PERIODO_VENTA, EAN) ──
+# Suma en un dict; si supera MAX_CLAVES_MEMORIA vuelca los parciales a un sqlite temporal
+acumulado = {}
+spill_db  = None
+lineas_leidas = 0
+
+def volcar_a_disco():
+    global spill_db
+    if spill_db is None:
+        spill_db = sqlite3.connect("")  # fichero temporal, se borra al cerrar
+        spill_db.execute(
+            "CREATE TABLE ventas (sucursal INTEGER, periodo TEXT, ean INTEGER, vendida INTEGER, devuelta INTEGER, "
+            "PRIMARY KEY (sucursal, periodo, ean))"
+        )
+    spill_db.executemany(
+        "INSERT INTO ventas VALUES (?, ?, ?, ?, ?) ON CONFLICT (sucursal, periodo, ean) DO UPDATE SET "
+        "vendida = vendida + excluded.vendida, devuelta = devuelta + excluded.devuelta",
+        ((*clave, v, d) for clave, (v, d) in acumulado.items())
+    )
+    spill_db.commit()
+    print(f"💾 Volcadas {len(acumulado)} claves a disco")
+    acumulado.clear()
+
+# Cada fichero SLSRPT del zip se decodifica y parsea de uno en uno
+ficheros_leidos = 0
 with zipfile.ZipFile(io.BytesIO(zip_bytes)) as z:
     for nombre in z.namelist():
-        if TIPO_DOCUMENTO in nombre:
-            edifact_text = z.read(nombre).decode("utf-8", errors="replace")
-            print(f"✅ Fichero EDI leído: {nombre}")
-
-if not edifact_text:
+        if TIPO_DOCUMENTO not in nombre:
+            continue
+        edifact_text = z.read(nombre).decode("utf-8", errors="replace")
+        print(f"✅ Fichero EDI leído: {nombre}")
+        ficheros_leidos += 1
+
+        for sucursal, periodo_venta, ean, vendida, devuelta in iter_lineas_slsrpt(edifact_text):
+            lineas_leidas += 1
+            clave = (sucursal, periodo_venta, ean)
+            previo = acumulado.get(clave)
+            if previo is not None:
+                acumulado[clave] = (previo[0] + vendida, previo[1] + devuelta)
+            else:
+                acumulado[clave] = (vendida, devuelta)
+                if len(acumulado) >= MAX_CLAVES_MEMORIA:
+                    volcar_a_disco()
+        del edifact_text
+
+if not ficheros_leidos:
     raise Exception("No se encontró fichero SLSRPT en el zip")
 
-# ── PASO 3: PARSEO EDIFACT ─────────────────────────────────
-segments = edifact_text.split("'")
-
-rows = []
-sucursal      = None
-periodo_venta = None
-
-i = 0
-while i < len(segments):
-    seg = segments[i]
-
-    if seg.startswith("LOC+162"):
-        match = re.search(r'(?<=\+162\+)\d+', seg)
-        if match:
-            sucursal = match.group()
-
-    elif seg.startswith("DTM"):
-        match = re.search(r'(?<=:)\d{8}', seg)
-        if match:
-            periodo_venta = datetime.strptime(match.group(), "%Y%m%d").strftime("%Y-%m-%d")
-
-    elif seg.startswith("LIN"):
-        ean_match = re.search(r'(?<=\+\+)\d+', seg)
-        if not ean_match:
-            i += 1
-            continue
-        ean = ean_match.group()
-        cantidad_vendida  = 0
-        cantidad_devuelta = 0
-
-        j = i + 1
-        while j < len(segments):
-            qty_seg = segments[j]
-            if qty_seg.startswith("QTY"):
-                qty_type  = re.search(r'(?<=\+)[0-9A-Z]+', qty_seg)
-                qty_value = re.search(r'(?<=:)\d+', qty_seg)
-                if qty_type and qty_value:
-                    if qty_type.group() == "153":
-                        cantidad_vendida = int(qty_value.group())
-                    elif qty_type.group() == "77E":
-                        cantidad_devuelta = int(qty_value.group())
-            elif qty_seg.startswith("LIN") or qty_seg.startswith("LOC+162"):
-                break
-            j += 1
-
-        if sucursal and periodo_venta and ean:
-            rows.append({
-                "SUCURSAL":          int(sucursal),
-                "PERIODO_VENTA":     periodo_venta,
-                "EAN":               int(ean),
-                "Cantidad_Vendida":  cantidad_vendida,
-                "Cantidad_Devuelta": cantidad_devuelta,
-                "Total":             cantidad_vendida - cantidad_devuelta
-            })
-        i = j - 1
-
-    i += 1
-
-df = pd.DataFrame(rows)
-print(f"✅ Registros parseados: {len(df)}")
-print(df.head())
+if spill_db is not None:
+    volcar_a_disco()
+    total_consolidado = spill_db.execute("SELECT COUNT(*) FROM ventas").fetchone()[0]
+else:
+    total_consolidado = len(acumulado)
+
+def a_registro(sucursal, periodo_venta, ean, vendida, devuelta):
+    return {
+        "SUCURSAL":          sucursal,
+        "PERIODO_VENTA":     periodo_venta,
+        "EAN":               ean,
+        "Cantidad_Vendida":  vendida,
+        "Cantidad_Devuelta": devuelta,
+        "Total":             vendida - devuelta
+    }
+
+def iter_lotes(tam):
+    """Devuelve los registros consolidados en lotes de `tam`, sin materializarlos todos"""
+    if spill_db is not None:
+        cursor = spill_db.execute("SELECT sucursal, periodo, ean, vendida, devuelta FROM ventas")
+        lote = cursor.fetchmany(tam)
+        while lote:
+            yield [a_registro(*fila) for fila in lote]
+            lote = cursor.fetchmany(tam)
+    else:
+        items = iter(acumulado.items())
+        lote = list(islice(items, tam))
+        while lote:
+            yield [a_registro(*clave, v, d) for clave, (v, d) in lote]
+            lote = list(islice(items, tam))
+
+print(f"✅ Líneas EDI leídas: {lineas_leidas} → registros consolidados: {total_consolidado}")
+print(pd.DataFrame(next(iter_lotes(5), [])).head())
 
 # ── PASO 4: CONTROL DUPLICADOS + INSERTAR EN SUPABASE ──────
 sb_headers = {
@@ -172,9 +240,8 @@ r_check = requests.get(
 if r_check.json():
     print(f"⚠️ Ya existen registros para {fecha_ayer}, abortando para evitar duplicados.")
 else:
-    registros = df.to_dict(orient="records")
-    for i in range(0, len(registros), 1000):
-        lote = registros[i:i+1000]
+    i = 0
+    for lote in iter_lotes(1000):
         r = requests.post(
             f"{SUPABASE_URL}/rest/v1/FACT_SALES_ECI",
             headers=sb_headers,
@@ -184,7 +251,11 @@ else:
             print(f"✅ Lote {i}-{i+len(lote)} insertado")
         else:
             print(f"❌ Error en lote {i}: {r.text}")
-    print(f"✅ Carga completada: {len(registros)} registros para {fecha_ayer}")
+        i += len(lote)
+    print(f"✅ Carga completada: {i} registros para {fecha_ayer}")
+
+if spill_db is not None:
+    spill_db.close()
 
 
 # In[ ]:
@@ -1,4 +1,5 @@
 import os
+import json
 import time
 import requests
 import xmlrpc.client
@@ -16,17 +17,48 @@ ODOO_DB = os.getenv('ODOO_DB')
 SLACK_BOT_TOKEN = os.getenv('SLACK_BOT_TOKEN')
 SLACK_CHANNEL_ID = os.getenv('SLACK_CHANNEL_ID')
 
-MAX_ROWS = 5000
 SEND_IF_ZERO = False  # True => si no hay pendientes, no envía nada
 
 OUT_DIR = "."  # carpeta donde guardar el Excel
 MODEL_PICKING = "lo.stock.picking"   # vuestro modelo logístico
 
-# IDs de tipo operación
-PICKING_TYPES = [6, 35, 87]  # Devoluciones + Devoluciones Reveni + Cambios
-
-# Estados pendientes
-PENDING_STATES = ["assigned", "waiting", "confirmed"]
+# Columnas disponibles para el Excel y campos de lo.stock.picking que necesita cada una
+COLUMN_FIELDS = {
+    "Albaran": ["name"],
+    "Fecha prevista": ["scheduled_date"],
+    "Tipo": ["picking_type_id"],
+    "Cliente": ["partner_id"],
+    "Pedido origen": ["origin"],
+    "ID externo": ["external_id"],
+    "Estado": ["state"],
+    "Fecha hecho": ["date_done"],
+    "URL": ["name"],
+}
+DEFAULT_COLUMNS = ["Albaran", "Fecha prevista", "Tipo", "Cliente", "Pedido origen", "ID externo", "Estado", "URL"]
+
+# Parámetros del enlace a Odoo en el Excel (por defecto, menú/acción de devoluciones)
+DEFAULT_URL_PARAMS = {"menu_id": 238, "action": 393, "active_id": 6}
+
+# Campos que siempre hacen falta para agrupar y repartir entre informes
+BASE_FIELDS = ["id", "name", "state", "picking_type_id", "scheduled_date", "date_done"]
+
+# Informes a generar. Cada uno declara sus tipos de operación, estados pendientes,
+# canal de Slack, columnas del Excel y parámetros del enlace (url_params).
+# Se puede sobrescribir con REPORTS_JSON (lista JSON).
+REPORTS = [
+    {
+        "name": "Devoluciones",
+        "title": "📦 Informe de devoluciones",
+        "label": "devoluciones",
+        "picking_types": [6, 35, 87],  # Devoluciones + Devoluciones Reveni + Cambios
+        "pending_states": ["assigned", "waiting", "confirmed"],
+        "channel": SLACK_CHANNEL_ID,
+        "columns": DEFAULT_COLUMNS,
+        "url_params": DEFAULT_URL_PARAMS,
+    },
+]
+if os.getenv("REPORTS_JSON"):
+    REPORTS = json.loads(os.getenv("REPORTS_JSON"))
 
 # ============================================================
 # HELPERS
@@ -176,14 +208,44 @@ log(f"✅ Autenticado. uid={uid}")
 models = xmlrpc.client.ServerProxy(f"{ODOO_URL}/xmlrpc/2/object", allow_none=True)
 
 # ============================================================
-# 1) OBTENER NOMBRES DE TIPOS DE OPERACIÓN
+# 1) PLAN DE CONSULTA COMÚN A TODOS LOS INFORMES
+# ============================================================
+report_names = set()
+for report in REPORTS:
+    missing = [k for k in ("name", "picking_types") if not report.get(k)]
+    if missing:
+        raise Exception(f"Faltan claves obligatorias en informe {report}: {missing}")
+    if report["name"] in report_names:
+        raise Exception(f"Nombre de informe duplicado: '{report['name']}'")
+    report_names.add(report["name"])
+    report.setdefault("title", f"📦 Informe de {report['name'].lower()}")
+    report.setdefault("label", report["name"].lower())
+    report.setdefault("pending_states", ["assigned", "waiting", "confirmed"])
+    report.setdefault("channel", SLACK_CHANNEL_ID)
+    report.setdefault("columns", DEFAULT_COLUMNS)
+    report.setdefault("url_params", DEFAULT_URL_PARAMS)
+    unknown = [c for c in report["columns"] if c not in COLUMN_FIELDS]
+    if unknown:
+        raise Exception(f"Columnas desconocidas en informe '{report['name']}': {unknown}")
+
+all_picking_types = sorted({t for r in REPORTS for t in r["picking_types"]})
+all_pending_states = sorted({s for r in REPORTS for s in r["pending_states"]})
+all_fields = list(dict.fromkeys(
+    BASE_FIELDS + [f for r in REPORTS for c in r["columns"] for f in COLUMN_FIELDS[c]]
+))
+
+log(f"🧩 Informes: {[r['name'] for r in REPORTS]}")
+log(f"🧩 Tipos (unión): {all_picking_types} | Estados pendientes (unión): {all_pending_states}")
+
+# ============================================================
+# 2) OBTENER NOMBRES DE TIPOS DE OPERACIÓN
 # ============================================================
 log("🔎 Obteniendo nombres de tipos de operación...")
 
 picking_type_data = safe_execute_kw(
     models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
     "stock.picking.type", "read",
-    args=[PICKING_TYPES],
+    args=[all_picking_types],
     kwargs={"fields": ["id", "name"]},
     label="read_picking_types"
 )
@@ -193,42 +255,7 @@ picking_type_names = {pt["id"]: pt["name"] for pt in picking_type_data}
 log(f"✅ Tipos de operación: {picking_type_names}")
 
 # ============================================================
-# 2) PENDIENTES
-# ============================================================
-log("🔎 Buscando devoluciones PENDIENTES (assigned/waiting/confirmed) en lo.stock.picking...")
-
-pending_ids = safe_execute_kw(
-    models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-    MODEL_PICKING, "search",
-    args=[[
-        ["state", "in", PENDING_STATES],
-        ["picking_type_id", "in", PICKING_TYPES],
-    ]],
-    kwargs={"limit": MAX_ROWS},
-    label="search_pending"
-)
-
-log(f"📦 Pendientes encontrados: {len(pending_ids)}")
-
-pending_pickings = []
-if pending_ids:
-    pending_pickings = safe_execute_kw(
-        models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-        MODEL_PICKING, "read",
-        args=[pending_ids],
-        kwargs={"fields": ["id", "name", "scheduled_date", "picking_type_id", "partner_id", "origin", "external_id", "state", "date_done"]},
-        label="read_pending"
-    )
-
-pending_count = len(pending_pickings)
-log(f"✅ Pendientes leídos: {pending_count}")
-
-if pending_count == 0 and SEND_IF_ZERO:
-    log("ℹ️ No hay pendientes y SEND_IF_ZERO=True → saliendo.")
-    raise SystemExit
-
-# ============================================================
-# 3) DONE AÑO ACTUAL (todos los meses)
+# 3) PENDIENTES + DONE AÑO ACTUAL EN UNA SOLA CONSULTA
 # ============================================================
 today = date.today()
 current_year = today.year
@@ -239,122 +266,48 @@ year_start = date(current_year, 1, 1).strftime("%Y-%m-%d 00:00:00")
 # Hasta hoy
 today_end = datetime.now().strftime("%Y-%m-%d 23:59:59")
 
-log(f"🔎 Buscando devoluciones DONE del año {current_year} (desde {year_start})...")
+# Pendientes (cualquier fecha) OR done del año actual, para todos los tipos a la vez.
+# Sin límite: un tope compartido recortaría pendientes a costa de los done.
+log(f"🔎 Buscando albaranes PENDIENTES y DONE del año {current_year} en {MODEL_PICKING}...")
 
-done_year_ids = safe_execute_kw(
+all_pickings = safe_execute_kw(
     models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-    MODEL_PICKING, "search",
+    MODEL_PICKING, "search_read",
     args=[[
+        ["picking_type_id", "in", all_picking_types],
+        "|",
+        ["state", "in", all_pending_states],
+        "&", "&",
         ["state", "=", "done"],
-        ["picking_type_id", "in", PICKING_TYPES],
         ["date_done", ">=", year_start],
         ["date_done", "<=", today_end],
     ]],
-    kwargs={"limit": MAX_ROWS},
-    label="search_done_year"
-)
-
-log(f"✅ DONE año {current_year}: {len(done_year_ids)}")
-
-done_year_pickings = safe_execute_kw(
-    models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-    MODEL_PICKING, "read",
-    args=[done_year_ids],
-    kwargs={"fields": ["id", "name", "date_done"]},
-    label="read_done_year"
+    kwargs={"fields": all_fields},
+    label="search_read_pickings"
 )
 
-# ============================================================
-# 4) AGRUPAR DONE POR MES Y SEMANA
-# ============================================================
-monthly_returns = defaultdict(int)  # {mes_num: count}
-weekly_returns = defaultdict(int)   # {semana_iso: count} solo del mes actual
-
-for p in done_year_pickings:
-    date_done = p.get("date_done")
-    if date_done:
-        date_obj = datetime.strptime(date_done, "%Y-%m-%d %H:%M:%S").date()
-        month_num = date_obj.month
-        monthly_returns[month_num] += 1
-        
-        # Si es del mes actual, también contar por semana
-        if month_num == current_month:
-            week_iso = get_week_iso(date_obj)
-            if week_iso != -1:
-                weekly_returns[week_iso] += 1
+pending_pickings = [p for p in all_pickings if p.get("state") in all_pending_states]
+done_year_pickings = [p for p in all_pickings if p.get("state") == "done"]
 
-# ============================================================
-# 5) AGRUPAR PENDIENTES POR TIPO Y MES-AÑO (scheduled_date)
-# ============================================================
-pending_by_type_month = defaultdict(lambda: defaultdict(int))  # {tipo: {(año, mes): count}}
-pending_by_type_total = defaultdict(int)  # Para contar totales por tipo
-
-for p in pending_pickings:
-    scheduled = p.get("scheduled_date")
-    pt = p.get("picking_type_id")
-    
-    # Obtener ID del tipo de operación
-    tipo_id = pt[0] if isinstance(pt, list) and len(pt) > 0 else None
-    
-    # Obtener nombre correcto del diccionario
-    tipo_nombre = picking_type_names.get(tipo_id, "Sin tipo")
-    
-    # Contar total por tipo (sin importar si tiene scheduled_date)
-    pending_by_type_total[tipo_nombre] += 1
-    
-    if scheduled:
-        try:
-            # scheduled_date puede venir como "YYYY-MM-DD" o "YYYY-MM-DD HH:MM:SS"
-            if len(scheduled) > 10:
-                date_obj = datetime.strptime(scheduled, "%Y-%m-%d %H:%M:%S").date()
-            else:
-                date_obj = datetime.strptime(scheduled, "%Y-%m-%d").date()
-            
-            year_num = date_obj.year
-            month_num = date_obj.month
-            
-            # Agrupar por tipo y (año, mes)
-            pending_by_type_month[tipo_nombre][(year_num, month_num)] += 1
-        except Exception as e:
-            log(f"⚠️ Error parseando scheduled_date: {scheduled} - {e}")
-    else:
-        log(f"⚠️ Pendiente sin scheduled_date: {p.get('name')} - Tipo: {tipo_nombre}")
-
-# Log de totales por tipo
-log(f"📊 Pendientes por tipo:")
-for tipo, count in sorted(pending_by_type_total.items()):
-    log(f"   • {tipo}: {count} pendientes")
-    if tipo in pending_by_type_month:
-        log(f"     └─ Con fecha válida: {sum(pending_by_type_month[tipo].values())}")
-    else:
-        log(f"     └─ Con fecha válida: 0 (NO APARECERÁ EN LA TABLA)")
+log(f"✅ Leídos {len(all_pickings)} albaranes: {len(pending_pickings)} pendientes, {len(done_year_pickings)} done")
 
 # ============================================================
-# 6) OBTENER IDS CORRECTOS DE STOCK.PICKING
+# 4) OBTENER IDS CORRECTOS DE STOCK.PICKING
 # ============================================================
 log("🔎 Buscando IDs correspondientes en stock.picking...")
 
 # Extraer todos los nombres de albaranes
 picking_names = [p.get("name") for p in pending_pickings if p.get("name")]
 
-# Buscar en stock.picking usando los nombres
-stock_picking_ids = safe_execute_kw(
-    models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-    "stock.picking", "search",
-    args=[[["name", "in", picking_names]]],
-    kwargs={"limit": MAX_ROWS},
-    label="search_stock_picking"
-)
-
-# Leer los registros de stock.picking
+# Buscar y leer en stock.picking usando los nombres
 stock_pickings_data = []
-if stock_picking_ids:
+if picking_names:
     stock_pickings_data = safe_execute_kw(
         models, ODOO_DB, uid, ODOO_PASSWORD or os.getenv("ODOO_PASSWORD"),
-        "stock.picking", "read",
-        args=[stock_picking_ids],
+        "stock.picking", "search_read",
+        args=[[["name", "in", picking_names]]],
         kwargs={"fields": ["id", "name"]},
-        label="read_stock_picking"
+        label="search_read_stock_picking"
     )
 
 # Crear diccionario: nombre -> id de stock.picking
@@ -363,143 +316,200 @@ name_to_stock_id = {sp["name"]: sp["id"] for sp in stock_pickings_data}
 log(f"✅ Mapeados {len(name_to_stock_id)} albaranes a stock.picking IDs")
 
 # ============================================================
-# 7) EXCEL CON HIPERVÍNCULO CORREGIDO
+# HELPERS DE INFORME (trabajan sobre los datos ya descargados)
 # ============================================================
-excel_rows = []
+def picking_type_id_of(p):
+    pt = p.get("picking_type_id")
+    return pt[0] if isinstance(pt, list) and len(pt) > 0 else None
 
-for p in pending_pickings:
+def build_excel_row(p, report):
     partner = p.get("partner_id")
-    cliente = partner[1] if isinstance(partner, list) and len(partner) > 1 else "—"
-
     pt = p.get("picking_type_id")
-    tipo = pt[1] if isinstance(pt, list) and len(pt) > 1 else "—"
-
-    origen = p.get("origin") or "—"
-    external_id = p.get("external_id") or "—"
-    scheduled = p.get("scheduled_date") or "—"
-    
     albaran_name = p.get("name", "")
 
     # Obtener el ID correcto de stock.picking usando el nombre
     stock_id = name_to_stock_id.get(albaran_name, p['id'])  # fallback al id original si no se encuentra
-    
-    # URL completa con todos los parámetros (los valores de menu_id, action, active_id son fijos para devoluciones)
-    link = f"{ODOO_URL}/web#id={stock_id}&cids=1&menu_id=238&action=393&active_id=6&model=stock.picking&view_type=form"
+    url_params = "&".join(f"{k}={v}" for k, v in report["url_params"].items())
 
-    excel_rows.append({
+    values = {
         "Albaran": albaran_name,
-        "Fecha prevista": scheduled,
-        "Tipo": tipo,
-        "Cliente": cliente,
-        "Pedido origen": origen,
-        "ID externo": external_id,
+        "Fecha prevista": p.get("scheduled_date") or "—",
+        "Tipo": pt[1] if isinstance(pt, list) and len(pt) > 1 else "—",
+        "Cliente": partner[1] if isinstance(partner, list) and len(partner) > 1 else "—",
+        "Pedido origen": p.get("origin") or "—",
+        "ID externo": p.get("external_id") or "—",
         "Estado": p.get("state", ""),
-        "URL": link,
-    })
-
-ts = datetime.now().strftime("%Y%m%d_%H%M")
-excel_name = f"Informe_Devoluciones_Pendientes_{ts}.xlsx"
-excel_path = os.path.join(OUT_DIR, excel_name)
-
-df = pd.DataFrame(excel_rows)
-df.to_excel(excel_path, index=False)
-log(f"📊 Excel generado: {excel_path}")
-
-# ============================================================
-# 8) MENSAJE SLACK MEJORADO
-# ============================================================
-now_local = datetime.now()
-
-# A) DONE - Resumen de meses anteriores + semanas del mes actual
-done_summary = []
-
-# Meses anteriores del año (1 hasta mes actual - 1)
-for m in range(1, current_month):
-    if m in monthly_returns:
-        month_name = get_month_name(m)
-        done_summary.append(f"• {month_name}: {monthly_returns[m]} devoluciones")
-
-# Agregar separación antes del mes actual
-if done_summary:
-    done_summary.append("")  # línea en blanco
-
-# Mes actual con desglose semanal
-current_month_total = monthly_returns.get(current_month, 0)
-current_month_name = get_month_name(current_month)
-done_summary.append(f"*{current_month_name} (mes actual):* {current_month_total}")
-
-weekly_lines = "\n".join([
-    f"  • Semana {week}: {count} devoluciones" 
-    for week, count in sorted(weekly_returns.items())
-]) or "  —"
+        "Fecha hecho": p.get("date_done") or "—",
+        # URL completa con todos los parámetros (menu_id, action, active_id vienen del informe)
+        "URL": f"{ODOO_URL}/web#id={stock_id}&cids=1&{url_params}&model=stock.picking&view_type=form",
+    }
+    return {col: values[col] for col in report["columns"]}
 
-done_summary.append(weekly_lines)
+def build_done_text(report, done):
+    """Resumen DONE: meses anteriores + semanas del mes actual"""
+    monthly_returns = defaultdict(int)  # {mes_num: count}
+    weekly_returns = defaultdict(int)   # {semana_iso: count} solo del mes actual
 
-done_text = "\n".join(done_summary)
+    for p in done:
+        date_done = p.get("date_done")
+        if date_done:
+            date_obj = datetime.strptime(date_done, "%Y-%m-%d %H:%M:%S").date()
+            month_num = date_obj.month
+            monthly_returns[month_num] += 1
+
+            # Si es del mes actual, también contar por semana
+            if month_num == current_month:
+                week_iso = get_week_iso(date_obj)
+                if week_iso != -1:
+                    weekly_returns[week_iso] += 1
+
+    done_summary = []
+
+    # Meses anteriores del año (1 hasta mes actual - 1)
+    for m in range(1, current_month):
+        if m in monthly_returns:
+            done_summary.append(f"• {get_month_name(m)}: {monthly_returns[m]} {report['label']}")
+
+    # Agregar separación antes del mes actual
+    if done_summary:
+        done_summary.append("")  # línea en blanco
+
+    # Mes actual con desglose semanal
+    current_month_total = monthly_returns.get(current_month, 0)
+    done_summary.append(f"*{get_month_name(current_month)} (mes actual):* {current_month_total}")
+
+    weekly_lines = "\n".join([
+        f"  • Semana {week}: {count} {report['label']}"
+        for week, count in sorted(weekly_returns.items())
+    ]) or "  —"
+
+    done_summary.append(weekly_lines)
+    return "\n".join(done_summary)
+
+def build_pending_table(report, pending):
+    """Tabla multi-fila de pendientes por tipo de operación y mes-año (scheduled_date)"""
+    pending_by_type_month = defaultdict(lambda: defaultdict(int))  # {tipo: {(año, mes): count}}
+    pending_by_type_total = defaultdict(int)  # Para contar totales por tipo
+
+    for p in pending:
+        scheduled = p.get("scheduled_date")
+
+        # Obtener nombre correcto del diccionario
+        tipo_nombre = picking_type_names.get(picking_type_id_of(p), "Sin tipo")
+
+        # Contar total por tipo (sin importar si tiene scheduled_date)
+        pending_by_type_total[tipo_nombre] += 1
+
+        if scheduled:
+            try:
+                # scheduled_date puede venir como "YYYY-MM-DD" o "YYYY-MM-DD HH:MM:SS"
+                if len(scheduled) > 10:
+                    date_obj = datetime.strptime(scheduled, "%Y-%m-%d %H:%M:%S").date()
+                else:
+                    date_obj = datetime.strptime(scheduled, "%Y-%m-%d").date()
+
+                # Agrupar por tipo y (año, mes)
+                pending_by_type_month[tipo_nombre][(date_obj.year, date_obj.month)] += 1
+            except Exception as e:
+                log(f"⚠️ Error parseando scheduled_date: {scheduled} - {e}")
+        else:
+            log(f"⚠️ Pendiente sin scheduled_date: {p.get('name')} - Tipo: {tipo_nombre}")
+
+    # Log de totales por tipo
+    log(f"📊 [{report['name']}] Pendientes por tipo:")
+    for tipo, count in sorted(pending_by_type_total.items()):
+        log(f"   • {tipo}: {count} pendientes")
+        if tipo in pending_by_type_month:
+            log(f"     └─ Con fecha válida: {sum(pending_by_type_month[tipo].values())}")
+        else:
+            log(f"     └─ Con fecha válida: 0 (NO APARECERÁ EN LA TABLA)")
+
+    if not pending_by_type_month:
+        return "_No hay pendientes distribuidos por mes_"
 
-# B) PENDIENTES - Tabla multi-fila por tipo de operación
-if pending_by_type_month:
     # Obtener todos los meses únicos (ordenados)
     all_months = set()
     for tipo_data in pending_by_type_month.values():
         all_months.update(tipo_data.keys())
     all_months = sorted(all_months)
-    
+
     # Crear headers (meses)
     headers = " │ ".join([
-        f"{get_month_name(month)[:3]}-{year}".center(9) 
+        f"{get_month_name(month)[:3]}-{year}".center(9)
         for year, month in all_months
     ])
-    
+
     # Crear filas por tipo
     tipo_rows = []
     for tipo_nombre in sorted(pending_by_type_month.keys()):
         tipo_data = pending_by_type_month[tipo_nombre]
-        
+
         # Limitar nombre del tipo a 20 caracteres para que no desborde
         tipo_label = tipo_nombre[:20].ljust(20)
-        
+
         # Valores para cada mes
         values = " │ ".join([
             f"{tipo_data.get((year, month), 0)}".center(9)
             for year, month in all_months
         ])
-        
+
         tipo_rows.append(f"{tipo_label} │ {values}")
-    
+
     separator = "─" * (22 + 11 * len(all_months) - 1)
     header_line = " " * 22 + headers
-    
-    pending_table = f"```\n{header_line}\n{separator}\n" + "\n".join(tipo_rows) + "\n```"
-else:
-    pending_table = "_No hay pendientes distribuidos por mes_"
-
-# Mensaje completo
-slack_text = (
-    f"*📦 Informe de devoluciones*\n"
-    f"Generado: `{now_local.strftime('%Y-%m-%d %H:%M')}`\n\n"
-    f"*A) DONE (año {current_year}):*\n"
-    f"{done_text}\n\n"
-    f"*B) Pendientes totales:* {pending_count}\n"
-    f"*Distribución por mes:*\n"
-    f"{pending_table}\n"
-)
+
+    return f"```\n{header_line}\n{separator}\n" + "\n".join(tipo_rows) + "\n```"
 
 # ============================================================
-# 9) ENVIAR A SLACK
+# 5) REPARTIR EN MEMORIA, GENERAR Y ENVIAR CADA INFORME
 # ============================================================
-log(f"📨 Enviando informe a Slack channel={SLACK_CHANNEL_ID} ...")
-send_to_slack_with_excel(
-    channel_id=SLACK_CHANNEL_ID,
-    text=slack_text,
-    excel_path=excel_path,
-    title=excel_name,
-    in_thread=True  # pon False si lo quieres como mensaje suelto (sin hilo)
-)
-log("✅ Excel enviado a Slack")
+for report in REPORTS:
+    types = set(report["picking_types"])
+    pending = [
+        p for p in pending_pickings
+        if picking_type_id_of(p) in types and p.get("state") in report["pending_states"]
+    ]
+    done = [p for p in done_year_pickings if picking_type_id_of(p) in types]
+    pending_count = len(pending)
+
+    log(f"📋 [{report['name']}] Pendientes: {pending_count} | DONE año {current_year}: {len(done)}")
+
+    if pending_count == 0 and SEND_IF_ZERO:
+        log(f"ℹ️ [{report['name']}] No hay pendientes y SEND_IF_ZERO=True → se omite.")
+        continue
+
+    # Excel con hipervínculo corregido
+    ts = datetime.now().strftime("%Y%m%d_%H%M")
+    excel_name = f"Informe_{report['name'].replace(' ', '_')}_Pendientes_{ts}.xlsx"
+    excel_path = os.path.join(OUT_DIR, excel_name)
+
+    df = pd.DataFrame([build_excel_row(p, report) for p in pending], columns=report["columns"])
+    df.to_excel(excel_path, index=False)
+    log(f"📊 Excel generado: {excel_path}")
+
+    # Mensaje completo
+    slack_text = (
+        f"*{report['title']}*\n"
+        f"Generado: `{datetime.now().strftime('%Y-%m-%d %H:%M')}`\n\n"
+        f"*A) DONE (año {current_year}):*\n"
+        f"{build_done_text(report, done)}\n\n"
+        f"*B) Pendientes totales:* {pending_count}\n"
+        f"*Distribución por mes:*\n"
+        f"{build_pending_table(report, pending)}\n"
+    )
+
+    log(f"📨 Enviando informe '{report['name']}' a Slack channel={report['channel']} ...")
+    send_to_slack_with_excel(
+        channel_id=report["channel"],
+        text=slack_text,
+        excel_path=excel_path,
+        title=excel_name,
+        in_thread=True  # pon False si lo quieres como mensaje suelto (sin hilo)
+    )
+    log("✅ Excel enviado a Slack")
 
-# Borrar el archivo Excel después de enviarlo
-os.remove(excel_path)
-log(f"🗑️ Excel eliminado: {excel_path}")
+    # Borrar el archivo Excel después de enviarlo
+    os.remove(excel_path)
+    log(f"🗑️ Excel eliminado: {excel_path}")
 
 log("🏁 Fin del script.")